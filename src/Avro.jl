@@ -113,6 +113,13 @@ macro debug(level, msg)
     end)
 end
 
+# a `time_ns()` reading for debug timings, skipped (0) when debug output at `level`
+# is off so hot loops don't pay for the clock reads
+debugtime(level=1) = DEBUG_LEVEL[] >= level ? time_ns() : UInt64(0)
+
+# elapsed time between two `debugtime()` readings, formatted for debug messages
+elapsed(t0, t1) = Base.string(round((t1 - t0) / 1e6; digits=3), " ms")
+
 include("utils.jl")
 include("types.jl")
 include("tables.jl")
@@ -125,6 +132,8 @@ const COMPRESSORS = Dict{Symbol,Any}(
     :zstd => ZstdCompressor[],
     # :snappy => SnappyCompressor[],
 )
+# guards the COMPRESSORS pools, which blocks borrow default-level compressors from
+const COMPRESSORS_LOCK = ReentrantLock()
 
 const DECOMPRESSORS = Dict{Symbol,Any}(
     :bzip2 => Bzip2Decompressor,
@@ -135,7 +144,7 @@ const DECOMPRESSORS = Dict{Symbol,Any}(
 )
 
 function __init__()
-    for _ = 1:1 # replace 1 w/ Threads.nthreads() if we do multithreaded writing
+    for _ = 1:1 # seed each pool with one compressor; more are created when blocks are compressed concurrently
         bzip2 = Bzip2Compressor()
         CodecBzip2.TranscodingStreams.initialize(bzip2)
         push!(COMPRESSORS[:bzip2], bzip2)
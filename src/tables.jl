@@ -21,12 +21,16 @@ partition will be written as a separate "block" in the container file.
 
 Because avro data is strictly typed, if the input table doesn't have a
 well-defined schema (i.e. `Tables.schema(Tables.rows(tbl)) === nothing`),
-then `Tables.dictrowtable(Tables.rows(tbl))` will be called, which scans
+then `Tables.dictcolumntable(Tables.rows(tbl))` will be called, which scans
 the input table, "building up" the schema based on types of values found
 in each row.
 
 Compression is supported via the `compress` keyword argument, and can
-currently be one of `:zstd`, `:deflate`, `:bzip2`, or `:xz`.
+currently be one of `:zstd`, `:deflate`, `:bzip2`, or `:xz`. The
+`compresslevel` keyword argument sets the compression level of the codec
+(the block size in 100k units, 1-9, for `:bzip2`), trading compression
+ratio for speed; by default each codec's standard level is used. Passing
+`compresslevel` without a supported `compress` codec throws an `ArgumentError`.
 """
 function writetable end
 
@@ -39,95 +43,261 @@ function writetable(file::String, tbl; kw...)
     return file
 end
 
-function writetable(io::IO, source; compress::Union{Nothing, Symbol}=nothing, kw...)
+function writetable(io::IO, source; compress::Union{Nothing, Symbol}=nothing, compresslevel::Union{Nothing, Integer}=nothing, kw...)
     parts = Tables.partitions(source)
     state = iterate(parts)
     state === nothing && error("no data in input; unable to write avro file")
     part, st = state
-    rows = Tables.rows(part)
+    rows = partrows(part)
     sch = Tables.schema(rows)
     dictrow = false
     if sch === nothing || !Base.haslength(rows)
-        rows = Tables.dictrowtable(rows)
-        sch = Tables.schema(rows)
+        cols = Tables.dictcolumntable(rows)
+        sch = Tables.schema(cols)
+        rows = columnrows(cols, sch)
         dictrow = true
     end
-    writewithschema(io, parts, rows, st, sch, dictrow, compress, kw)
+    if !haskey(COMPRESSORS, compress)
+        compresslevel === nothing || throw(ArgumentError("`compresslevel` requires a supported `compress` codec (:zstd, :deflate, :bzip2 or :xz), got compress = $(repr(compress))"))
+        # unsupported codecs are ignored and the file is written uncompressed
+        compress = nothing
+    end
+    writewithschema(io, parts, rows, st, sch, dictrow, compress, compresslevel, kw)
     return io
 end
 
-function writewithschema(io, parts, rows, st, sch, dictrow, compress, kw)
-    comp = get(COMPRESSORS, compress, nothing)
+# a fresh, initialized compressor, at the codec's default level if `level === nothing`;
+# the caller is responsible for finalizing it
+function compressor(compress::Symbol, level::Union{Nothing, Integer}=nothing)
+    kw = level === nothing ? NamedTuple() : compress === :bzip2 ? (blocksize100k=level,) : (level=level,)
+    comp = compress === :deflate ? DeflateCompressor(; kw...) :
+           compress === :zstd ? ZstdCompressor(; kw...) :
+           compress === :xz ? XzCompressor(; kw...) :
+           compress === :bzip2 ? Bzip2Compressor(; kw...) :
+           throw(ArgumentError("unsupported compression codec: $compress"))
+    CodecZlib.TranscodingStreams.initialize(comp)
+    return comp
+end
+
+# lay out dict-materialized columns as concretely typed vectors in schema order, so the
+# sizing and writing passes read each field straight out of its column instead of
+# going through a Dict per row; columns a partition doesn't have are all missing
+function columnrows(cols, ::Tables.Schema{names, types}) where {names, types}
+    colnames = Tables.columnnames(cols)
+    n = isempty(colnames) ? 0 : length(Tables.getcolumn(cols, first(colnames)))
+    vecs = ntuple(Val(length(names))) do j
+        nm, T = names[j], fieldtype(types, j)
+        if !(nm in colnames)
+            Missing <: T || throw(ArgumentError("column `$nm` is missing from a partition, but its type in the file schema, $T, doesn't allow missing values"))
+            return Vector{T}(missing, n)
+        end
+        col = Tables.getcolumn(cols, nm)
+        try
+            return convert(Vector{T}, col)
+        catch e
+            (e isa MethodError || e isa InexactError) || rethrow()
+            throw(ArgumentError("column `$nm` of element type $(eltype(col)) can't be converted to its type in the file schema, $T"))
+        end
+    end
+    return Tables.rows(NamedTuple{names}(vecs))
+end
 
+# column-oriented partitions are encoded from a NamedTuple of their (uncopied) columns,
+# so each field is read straight out of a concretely typed vector instead of through
+# the source's own row view, which for many sources isn't type-stable
+function partrows(part)
+    if Tables.columnaccess(part)
+        cols = Tables.columns(part)
+        Tables.schema(cols) === nothing || return Tables.rows(Tables.columntable(cols))
+    end
+    return Tables.rows(part)
+end
+
+function writewithschema(io, parts, rows, st, sch, dictrow, compress, compresslevel, kw)
     schtyp = schematype(sch)
     meta = Dict("avro.schema" => JSON3.write(schtyp))
-    if comp !== nothing
+    # rows are sized/written through the compiled form of the schema
+    rowtyp = compile(schtyp)
+    if compress !== nothing
         meta["avro.codec"] = String(compress)
     end
     sync = _cast(NTuple{16, UInt8}, rand(UInt128))
     buf = write((magic=MAGIC, meta=meta, sync=sync); schema=FileHeaderRecordType)
     Base.write(io, buf)
-    @debug 1 "wrote file header from bytes 1:$(pos - 1)"
-    i = 1
-    while true
-        # if rows didn't have schema or length, we materialized w/ Tables.dictrowtable
-        nrow = length(rows)
-        @debug 1 "writing block count ($nrow) at pos = $pos"
-        rowsstate = iterate(rows)
-        pos = 1
-        if rowsstate === nothing
-            bytes = UInt8[]
-            pos = 0
+    @debug 1 "wrote file header: $(length(buf)) bytes"
+    # blocks borrow their compressor: default-level ones from the shared, long-lived
+    # COMPRESSORS pool (which keeps at most the one compressor it's seeded with), ones
+    # for a specific level from a pool only used by this call
+    pool = compress === nothing ? nothing :
+        compresslevel === nothing ? CompressorPool(compress, nothing, COMPRESSORS[compress], COMPRESSORS_LOCK, 1) :
+        CompressorPool(compress, compresslevel, Any[], ReentrantLock(), typemax(Int))
+    try
+        # look ahead one partition: a table with a single block gains nothing from threads
+        next = nextrows(parts, st, sch, dictrow)
+        if Threads.nthreads() > 1 && next !== nothing
+            writeblocksthreaded(io, parts, rows, next, sch, dictrow, rowtyp, pool, sync, kw)
         else
-            row, rowst = rowsstate
-            # calc nbytes on all rows to find max, then allocate bytes
-            bytesperrow = nbytes(schtyp, row)
-            while true 
-                rowsstate = iterate(rows, rowst)
-                rowsstate === nothing && break
-                row, rowst = rowsstate
-                nb = nbytes(schtyp, row)
-                if nb > bytesperrow
-                    bytesperrow = nb
-                end
+            comp = borrow(pool)
+            try
+                writeblocks(io, parts, rows, next, sch, dictrow, rowtyp, comp, sync, kw)
+            finally
+                giveback(pool, comp)
             end
-            rowsstate = iterate(rows)
-            row, rowst = rowsstate
-            blen = trunc(Int, nrow * bytesperrow * 1.05) # add 5% cushion
-            bytes = Vector{UInt8}(undef, blen)
-            n = 1
-            nb = nbytes(schtyp, row)
-            while true
-                pos = writevalue(Binary(), schtyp, row, bytes, pos, blen, kw)
-                rowsstate = iterate(rows, rowst)
-                rowsstate === nothing && break
-                row, rowst = rowsstate
-                nb = nbytes(schtyp, row)
-                bytesperrow += nb
-                n += 1
+        end
+    finally
+        # compressors for a specific level only live for this call
+        if compresslevel !== nothing && pool !== nothing
+            foreach(CodecZlib.TranscodingStreams.finalize, pool.comps)
+        end
+    end
+    return
+end
+
+# initialized compressors for a single codec and level, borrowed by each block being
+# compressed, so concurrent blocks never share one; a new compressor is only created
+# when every pooled one is in use, and finalized on return if the pool already holds
+# `cap` compressors
+struct CompressorPool
+    compress::Symbol
+    level::Union{Nothing, Int}
+    comps::Vector
+    lock::ReentrantLock
+    cap::Int
+end
+
+function borrow(pool::CompressorPool)
+    comp = lock(() -> isempty(pool.comps) ? nothing : pop!(pool.comps), pool.lock)
+    return comp === nothing ? compressor(pool.compress, pool.level) : comp
+end
+
+function giveback(pool::CompressorPool, comp)
+    kept = lock(pool.lock) do
+        length(pool.comps) < pool.cap || return false
+        push!(pool.comps, comp)
+        return true
+    end
+    kept || CodecZlib.TranscodingStreams.finalize(comp)
+    return
+end
+
+borrow(::Nothing) = nothing
+giveback(::Nothing, comp) = nothing
+
+# write every partition as a block, one after another, reusing a single block buffer
+# that only grows when a block needs more room; `next` is the already looked-up
+# partition after `rows`
+function writeblocks(io, parts, rows, next, sch, dictrow, rowtyp, comp, sync, kw)
+    bytes = UInt8[]
+    while true
+        writeblock(io, encodeblock(rowtyp, rows, bytes, comp, kw)..., sync)
+        next === nothing && break
+        rows, st = next
+        next = nextrows(parts, st, sch, dictrow)
+    end
+    return
+end
+
+# each partition is encoded (and compressed) in its own task, with its own buffer and
+# a compressor borrowed from `pool`; at most nthreads blocks are in flight, and
+# finished blocks are written to `io` in partition order
+function writeblocksthreaded(io, parts, rows, next, sch, dictrow, rowtyp, pool, sync, kw)
+    tasks = Task[]
+    try
+        while true
+            task = let rows = rows
+                Threads.@spawn begin
+                    comp = borrow(pool)
+                    try
+                        encodeblock(rowtyp, rows, UInt8[], comp, kw)
+                    finally
+                        giveback(pool, comp)
+                    end
+                end
             end
+            push!(tasks, task)
+            length(tasks) >= Threads.nthreads() && writeblock(io, fetchblock(popfirst!(tasks))..., sync)
+            next === nothing && break
+            rows, st = next
+            next = nextrows(parts, st, sch, dictrow)
         end
-        # compress
-        if comp !== nothing
-            finalbytes = transcode(comp[Threads.threadid()], unsafe_wrap(Base.Array, pointer(bytes), pos - 1))
-        else
-            finalbytes = bytes
+        while !isempty(tasks)
+            writeblock(io, fetchblock(popfirst!(tasks))..., sync)
         end
-        block = Block(nrow, view(finalbytes, 1:length(finalbytes)), sync)
-        buf = write(block; schema=BlockType)
-        Base.write(io, buf)
-        state = iterate(parts, st)
-        state === nothing && break
-        part, st = state
-        rows = Tables.rows(part)
-        sch = Tables.schema(rows)
-        if dictrow
-            rows = Tables.dictrowtable(rows)
+    finally
+        # if a block failed, let the ones still in flight finish before their
+        # compressors can be finalized
+        for task in tasks
+            try
+                wait(task)
+            catch
+            end
         end
     end
     return
 end
 
+# the result of a block task, rethrowing the exception the task threw, as the serial
+# path would have, instead of a TaskFailedException wrapping it
+function fetchblock(task::Task)
+    try
+        return fetch(task)
+    catch e
+        e isa TaskFailedException || rethrow()
+        throw(e.task.exception)
+    end
+end
+
+# the rows of the next partition, or `nothing` if there are no partitions left
+function nextrows(parts, st, sch, dictrow)
+    state = iterate(parts, st)
+    state === nothing && return nothing
+    part, st = state
+    rows = partrows(part)
+    # if rows didn't have schema or length, we materialize w/ Tables.dictcolumntable + columnrows
+    if dictrow
+        rows = columnrows(Tables.dictcolumntable(rows), sch)
+    end
+    return rows, st
+end
+
+# encode, and optionally compress, `rows` as the data of a single block; returns the
+# row count and the block data, which may be a view of the scratch buffer `bytes`
+function encodeblock(rowtyp, rows, bytes, comp, kw)
+    nrow = length(rows)
+    t0 = debugtime()
+    # 1st pass: sum the exact encoded size of every row
+    blen = nbytesrows(rowtyp, rows)
+    length(bytes) < blen && resize!(bytes, blen)
+    t1 = debugtime()
+    # 2nd pass: encode rows back-to-back into the (exactly sized) block buffer
+    pos = writerows(Binary(), rowtyp, rows, bytes, 1, blen, kw)
+    t2 = debugtime()
+    # compress
+    if comp !== nothing
+        finalbytes = GC.@preserve bytes transcode(comp, unsafe_wrap(Base.Array, pointer(bytes), pos - 1))
+        nfinal = length(finalbytes)
+    else
+        # only the first pos - 1 bytes of the scratch buffer belong to this block
+        finalbytes = bytes
+        nfinal = pos - 1
+    end
+    @debug 1 "encoded block: count = $nrow, size = $(pos - 1) ($nfinal written); sizing = $(elapsed(t0, t1)), encoding = $(elapsed(t1, t2)), compression = $(elapsed(t2, debugtime()))"
+    return nrow, view(finalbytes, 1:nfinal)
+end
+
+# emit a block (row count, byte size, data, sync marker) straight to `io`, rather
+# than encoding it as a `Block` record, which copies all block bytes into a new buffer
+function writeblock(io, count, data, sync)
+    n = length(data)
+    hdr = Vector{UInt8}(undef, nbytes(long, count) + nbytes(long, n))
+    pos = writevalue(Binary(), long, count, hdr, 1, length(hdr), nothing)
+    writevalue(Binary(), long, n, hdr, pos, length(hdr), nothing)
+    Base.write(io, hdr)
+    Base.write(io, data)
+    Base.write(io, sync...)
+    return
+end
+
 """
     Avro.Table
 
@@ -167,13 +337,50 @@ readtable(io::IO; kw...) = readtable(Base.read(io), 1, kw)
 readtable(io::IOBuffer; kw...) = readtable(take!(io), 1, kw)
 readtable(file::String; kw...) = readtable(Mmap.mmap(file), 1, kw)
 
+# schemas parsed from file headers, keyed by the schema json; reading many files
+# written with the same schema then only parses (and resolves) it once. a cached
+# schema is shared by every table read with that schema, so it's only ever read
+# from, never mutated; once the cache is full, the oldest schema is evicted first
+const FILE_SCHEMAS = Dict{String, Schema}()
+const FILE_SCHEMA_KEYS = String[] # insertion order of FILE_SCHEMAS keys
+const FILE_SCHEMAS_LOCK = ReentrantLock()
+const MAX_FILE_SCHEMAS = 256
+
+function fileschema(json)
+    str = String(json)
+    return lock(FILE_SCHEMAS_LOCK) do
+        sch = get(FILE_SCHEMAS, str, nothing)
+        if sch === nothing
+            length(FILE_SCHEMA_KEYS) >= MAX_FILE_SCHEMAS && delete!(FILE_SCHEMAS, popfirst!(FILE_SCHEMA_KEYS))
+            sch = FILE_SCHEMAS[str] = resolveprimitives(JSON3.read(str, Schema))
+            push!(FILE_SCHEMA_KEYS, str)
+        end
+        return sch
+    end
+end
+
 function readtable(buf, pos, kw)
     header, pos = readvalue(Binary(), FileHeaderRecordType, FileHeader, buf, pos, length(buf), nothing)
-    sch = JSON3.read(header.meta["avro.schema"], Schema)
-    comp = get(header.meta, "avro.codec", nothing)
+    # header fields are decoded lazily on each access, so decode the metadata map once
+    meta = header.meta
+    t0 = debugtime()
+    sch = fileschema(meta["avro.schema"])
+    @debug 1 "parsed file schema in $(elapsed(t0, debugtime()))"
+    comp = get(meta, "avro.codec", nothing)
     comp = get(DECOMPRESSORS, Symbol(comp), nothing)
     T = juliatype(sch)
-    data = readwithschema(T, sch, buf, pos, comp)
+    if comp === nothing
+        data = readwithschema(T, sch, buf, pos, nothing)
+    else
+        # a single decompressor is initialized up front and reused for every block
+        codec = comp()
+        CodecZlib.TranscodingStreams.initialize(codec)
+        data = try
+            readwithschema(T, sch, buf, pos, codec)
+        finally
+            CodecZlib.TranscodingStreams.finalize(codec)
+        end
+    end
     return Table(Tables.Schema(T), data)
 end
 
@@ -182,19 +389,22 @@ function readwithschema(::Type{T}, sch, buf, pos, comp) where {T}
     blocks = Array{T}[]
     while pos <= len
         block, pos = readvalue(Binary(), BlockType, Block, buf, pos, len, nothing)
-        @debug 1 "reading block: count = $(block.count), size = $(length(block.bytes))"
         values = Vector{Int}(undef, block.count)
+        t0 = debugtime()
         bytes = block.bytes
-        # uncompress
+        # uncompress straight from the (possibly mmapped) source buffer,
+        # without first copying the compressed block into its own Vector
         if comp !== nothing
-            bytes = transcode(comp, Vector{UInt8}(bytes))
+            bytes = GC.@preserve buf transcode(comp, unsafe_wrap(Base.Array, pointer(bytes), length(bytes)))
         end
+        t1 = debugtime()
         bpos = 1
         blen = length(bytes)
         for i = 1:block.count
             @inbounds values[i] = bpos
             bpos = skipvalue(Binary(), sch, T, bytes, bpos, blen, nothing)
         end
+        @debug 1 "read block: count = $(block.count), size = $(length(block.bytes)) ($blen uncompressed); decompression = $(elapsed(t0, t1)), indexing = $(elapsed(t1, debugtime()))"
         push!(blocks, Array{T}(bytes, values))
     end
     return ChainedVector(blocks)
@@ -125,3 +125,31 @@ include("types/fixed.jl")
 include("types/unions.jl")
 include("types/logical.jl")
 include("types/rows.jl")
+
+# resolve primitive type names in a parsed schema to their `PrimitiveType` once,
+# instead of converting the raw `String` for every value read or written
+resolveprimitives(sch) = sch
+
+function resolveprimitives(sch::String)
+    sch in ("null", "boolean", "int", "long", "float", "double", "bytes", "string") || return sch
+    return PrimitiveType(sch)
+end
+
+function resolveprimitives(sch::RecordType)
+    for f in sch.fields
+        f.type = resolveprimitives(f.type)
+    end
+    return sch
+end
+
+function resolveprimitives(sch::ArrayType)
+    sch.items = resolveprimitives(sch.items)
+    return sch
+end
+
+function resolveprimitives(sch::MapType)
+    sch.values = resolveprimitives(sch.values)
+    return sch
+end
+
+resolveprimitives(sch::UnionType) = map!(resolveprimitives, sch, sch)
@@ -125,39 +125,37 @@ end
 writevalue(B::Binary, N::NumberType, y::T, buf, pos, len, opts) where {T<:Unsigned} =
     writevalue(B, N, signed(widen(y)), buf, pos, len, opts)
 
+# number of 7-bit groups needed to hold the significant bits of `x` (at least 1),
+# computed from the leading zero count instead of shifting 7 bits at a time
+varintlength(x::Unsigned) = max(1, div(8 * sizeof(x) - leading_zeros(x) + 6, 7))
+
 function writevalue(::Binary, ::NumberType, y::T, buf, pos, len, opts) where {T<:Signed}
-    x = tozigzag(y)
-    while true
-        # are any bits higher than least 7 set? if not, we're done
-        if (x & ((~T(0)) << 7)) == 0
-            @inbounds buf[pos] = x % UInt8
-            return pos + 1
-        end
-        @inbounds buf[pos] = ((x & 0b1111111) | 0b10000000) % UInt8
+    x = unsigned(tozigzag(y))
+    # all but the last byte carry the continuation bit
+    for _ = 2:varintlength(x)
+        @inbounds buf[pos] = (x % UInt8) | 0x80
         pos += 1
         x >>>= 7
     end
+    @inbounds buf[pos] = x % UInt8
+    return pos + 1
 end
 
-function nbytes(::NumberType, y::T) where {T<:Integer}
-    x = tozigzag(y)
-    N = 1
-    while true
-        # are any bits higher than least 7 set? if not, we're done
-        if (x & ((~T(0)) << 7)) == 0
-            return N
-        end
-        x >>>= 7
-        N += 1
-    end
-end
+nbytes(N::NumberType, y::T) where {T<:Unsigned} = nbytes(N, signed(widen(y)))
+nbytes(::NumberType, y::T) where {T<:Signed} = varintlength(unsigned(tozigzag(y)))
 
+# unsigned values are written widened to the next signed type, so read them back the same way
 function _readvalue(B::Binary, N::NumberType, ::Type{T}, buf, pos, len, opts) where {T<:Unsigned}
-    x, pos = _readvalue(B, N, signed(T), buf, pos, len, opts)
-    return Core.bitcast(T, x), pos
+    x, pos = _readvalue(B, N, signed(widen(T)), buf, pos, len, opts)
+    return x % T, pos
 end
 
-function _readvalue(::Binary, ::NumberType, ::Type{T}, buf, pos, len, opts) where {T<:Signed}
+_readvalue(::Binary, ::NumberType, ::Type{T}, buf, pos, len, opts) where {T<:Signed} =
+    readvarint(T, buf, pos)
+
+readvarint(::Type{T}, buf, pos) where {T} = readvarintbytes(T, buf, pos)
+
+function readvarintbytes(::Type{T}, buf, pos) where {T}
     x = T(0)
     shift = 0
     len = length(buf)
@@ -171,6 +169,28 @@ function _readvalue(::Binary, ::NumberType, ::Type{T}, buf, pos, len, opts) wher
     return x, pos
 end
 
+const ContiguousBytes = Union{Vector{UInt8}, Base.FastContiguousSubArray{UInt8, 1, Vector{UInt8}}}
+
+# SWAR fast path for varints of up to 8 bytes: load 8 bytes at once, find the
+# terminating byte (high bit clear) from the trailing zero count, then pack the
+# 7-bit groups together with a fixed sequence of masks and shifts
+function readvarint(::Type{T}, buf::ContiguousBytes, pos) where {T}
+    if pos + 7 <= length(buf)
+        w = GC.@preserve buf ltoh(unsafe_load(Ptr{UInt64}(pointer(buf, pos))))
+        m = ~w & 0x8080808080808080
+        if m != 0
+            n = (trailing_zeros(m) >> 3) + 1
+            w &= (typemax(UInt64) >> (64 - 8n)) & 0x7f7f7f7f7f7f7f7f
+            w = (w & 0x007f007f007f007f) | ((w & 0x7f007f007f007f00) >> 1)
+            w = (w & 0x00003fff00003fff) | ((w & 0x3fff00003fff0000) >> 2)
+            w = (w & 0x000000000fffffff) | ((w & 0x0fffffff00000000) >> 4)
+            return fromzigzag(w % T), pos + n
+        end
+    end
+    # too close to the end of the buffer, or a varint longer than 8 bytes
+    return readvarintbytes(T, buf, pos)
+end
+
 function skipvalue(::Binary, ::NumberType, ::Type{T}, buf, pos, len, opts) where {T<:Integer}
     len = length(buf)
     @inbounds while pos <= len && (buf[pos] & 0x80) > 0
@@ -184,8 +204,8 @@ end
 function writevalue(::Binary, ::FloatTypes, x::T, buf, pos, len, opts) where {T<:Base.IEEEFloat}
     N = sizeof(T)
     @check N
-    ref = Ref(x)
-    GC.@preserve ref unsafe_copyto!(pointer(buf, pos), convert(Ptr{UInt8}, Base.unsafe_convert(Ref{T}, ref)), N)
+    # avro floats are little-endian IEEE 754; store all N bytes at once (unaligned)
+    GC.@preserve buf unsafe_store!(Ptr{T}(pointer(buf, pos)), htol(x))
     return pos + N
 end
 
@@ -195,7 +215,7 @@ function _readvalue(::Binary, ::FloatTypes, ::Type{T}, buf, pos, len, opts) wher
     @readcheck sizeof(T)
     GC.@preserve buf begin
         ptr::Ptr{T} = pointer(buf, pos)
-        x = unsafe_load(ptr)
+        x = ltoh(unsafe_load(ptr))
     end
     return x, pos + sizeof(T)
 end
@@ -225,6 +245,15 @@ function _writevalue(B::Binary, ::BytesOrString, x, buf, pos, len, opts)
     return pos
 end
 
+# strings are already stored as utf-8, so their bytes can be copied over as-is
+function _writevalue(B::Binary, ::StringType, x::String, buf, pos, len, opts)
+    N = sizeof(x)
+    pos = writevalue(B, long, N, buf, pos, len, opts)
+    @check N
+    GC.@preserve buf x unsafe_copyto!(pointer(buf, pos), pointer(x), N)
+    return pos + N
+end
+
 function _writevalue(B::Binary, ::BytesType, x::AbstractVector{UInt8}, buf, pos, len, opts)
     N = sizeof(x)
     pos = writevalue(B, long, N, buf, pos, len, opts)
@@ -233,7 +262,10 @@ function _writevalue(B::Binary, ::BytesType, x::AbstractVector{UInt8}, buf, pos,
     return pos + N
 end
 
-nbytes(::BytesOrString, x) = nbytes(long, sizeof(_codeunits(x))) + sizeof(_codeunits(x))
+function nbytes(::BytesOrString, x)
+    N = sizeof(_codeunits(x))
+    return nbytes(long, N) + N
+end
 
 function readvalue(B::Binary, ::BytesType, ::Type{T}, buf, pos, len, opts) where {T}
     N, pos = readvalue(B, long, Int64, buf, pos, len, opts)
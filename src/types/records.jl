@@ -50,14 +50,24 @@ juliatype(x::RecordType) = Record{symtup(map(f->f.name, x.fields)), Tuple{map(f-
 autoname(T::Type{Record{names, types, N}}) where {names, types, N} =
     Base.string("Record_", hash(T))
 
-schematype(::StructTypes.CustomStruct, ::Type{Record{names, types, N}}, name=autoname(Record{names, types, N})) where {names, types, N} =
-    schematype(Record{names, types})
+# record schemas derived from Julia types are cached per type, so that repeated
+# `Avro.write(x)` / `Avro.read(buf, T)` calls don't rebuild the schema every time;
+# the cached `RecordType` is shared by every later write/read of that type, so it
+# must be treated as read-only (callers wanting to modify one should `deepcopy` it)
+const RECORD_SCHEMAS = IdDict{Type, RecordType}()
+const RECORD_SCHEMAS_LOCK = ReentrantLock()
+
+cachedschema(f, ::Type{T}) where {T} =
+    lock(() -> get!(f, RECORD_SCHEMAS, T), RECORD_SCHEMAS_LOCK)
+
+schematype(::StructTypes.CustomStruct, ::Type{Record{names, types, N}}) where {names, types, N} =
+    cachedschema(() -> schematype(Record{names, types}), Record{names, types, N})
 schematype(::StructTypes.CustomStruct, ::Type{Record{names, types}}, name=autoname(Record{names, types, fieldcount(types)})) where {names, types} =
     RecordType(name, FieldType[FieldType(String(names[i]), schematype(fieldtype(types, i))) for i = 1:length(names)])
 schematype(::Type{NamedTuple{names, types}}) where {names, types} =
-    schematype(StructTypes.CustomStruct(), Record{names, types})
+    cachedschema(() -> schematype(StructTypes.CustomStruct(), Record{names, types}), NamedTuple{names, types})
 schematype(::StructTypes.DataType, ::Type{T}) where {T} =
-    schematype(StructTypes.CustomStruct(), Record{fieldnames(T), Tuple{fieldtypes(T)...}}, Base.string(T))
+    cachedschema(() -> schematype(StructTypes.CustomStruct(), Record{fieldnames(T), Tuple{fieldtypes(T)...}}, Base.string(T)), T)
 schematype(::StructTypes.CustomStruct, ::Type{T}) where {T} =
     schematype(StructTypes.lowertype(T))
 schematype(::StructTypes.ArrayType, ::Type{T}) where {T <: Tuple} =
@@ -54,3 +54,52 @@ function nbytes(RT::RowType, row)
     Tables.eachcolumn(c, RT.schema, row)
     return c.n
 end
+
+# a RowType with its field schemas lifted into a Tuple, so that writing or sizing
+# a row dispatches statically on each field's schema instead of going through
+# the abstract `Schema` stored in each `FieldType`
+struct CompiledRowType{S, F}
+    type::RowType{S}
+    fields::F
+end
+
+compile(RT::RowType) = CompiledRowType(RT, Tuple(f.type for f in RT.fields))
+
+mutable struct CompiledRowWriteClosure{B, F, T, KW}
+    fields::F
+    buf::T
+    pos::Int
+    len::Int
+    opts::KW
+end
+
+@inline function (f::CompiledRowWriteClosure{B, F, T, KW})(val, i, nm) where {B, F, T, KW}
+    f.pos = writevalue(B(), f.fields[i], val, f.buf, f.pos, f.len, f.opts)
+end
+
+mutable struct CompiledNBytesRowClosure{F}
+    fields::F
+    n::Int
+end
+
+@inline function (f::CompiledNBytesRowClosure{F})(val, i, nm) where {F}
+    f.n += nbytes(f.fields[i], val)
+end
+
+# a compiled row type only sizes/writes whole blocks of rows, reusing a single
+# closure for the block rather than allocating a new one for every row
+function writerows(B::Binary, T::CompiledRowType{S, F}, rows, buf, pos, len, opts) where {S, F}
+    c = CompiledRowWriteClosure{Binary, F, typeof(buf), typeof(opts)}(T.fields, buf, pos, len, opts)
+    for row in rows
+        Tables.eachcolumn(c, T.type.schema, row)
+    end
+    return c.pos
+end
+
+function nbytesrows(T::CompiledRowType{S, F}, rows) where {S, F}
+    c = CompiledNBytesRowClosure{F}(T.fields, 0)
+    for row in rows
+        Tables.eachcolumn(c, T.type.schema, row)
+    end
+    return c.n
+end
@@ -23,7 +23,7 @@ function tozigzag(x::T) where {T<:Integer}
 end
 
 function fromzigzag(x::T) where {T<:Integer}
-    return xor(x >> 1, -(x & T(1)))
+    return xor(x >>> 1, -(x & T(1)))
 end
 
 symtup(x) = Tuple(Symbol(nm) for nm in x)
@@ -67,5 +67,5 @@ the 2nd argument.
 """
 function parseschema(file)
     buf = isfile(file) ? Base.read(file) : codeunits(file)
-    return JSON3.read(buf, Avro.Schema)
+    return resolveprimitives(JSON3.read(buf, Avro.Schema))
 end
\ No newline at end of file
@@ -22,6 +22,12 @@ buf = Avro.write(64)
 
 x = typemax(UInt8)
 @test Avro.read(Avro.write(x), UInt8) === x
+x = typemax(UInt64)
+@test Avro.read(Avro.write(x), UInt64) === x
+# unsigned values with the top bit set
+for x in (UInt8(128), UInt8(200), UInt16(40000), UInt32(2^31), typemax(UInt32), UInt64(2)^63)
+    @test Avro.read(Avro.write(x), typeof(x)) === x
+end
 
 buf = Avro.write(-1)
 @test buf[1] == 0x01
@@ -40,6 +46,10 @@ end
 for x in (-0.0001, 0.0, -0.0, 1.0, floatmin(Float32), floatmax(Float32), floatmin(Float64), floatmax(Float64))
     @test x === Avro.read(Avro.write(x), typeof(x))
 end
+@test Avro.write(1.5) == UInt8[0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xf8, 0x3f]
+# floats at unaligned offsets
+x = (name="abc", age=41, score=-2.5, weight=Float32(0.1), active=true)
+@test x == Avro.read(Avro.write(x), typeof(x))
 
 # bytes
 x = [UInt8(y) for y in "hey there stranger"]
@@ -55,10 +65,21 @@ x = "hey there stranger"
 x = ""
 @test x == Avro.read(Avro.write(x), typeof(x))
 
+x = "Ωmega ∑ 🚀"
+@test Avro.write(x) == [0x1e; codeunits(x)]
+@test x == Avro.read(Avro.write(x), typeof(x))
+@test Avro.nbytes(Avro.string, SubString(x, 1, 3)) == 1 + sizeof(SubString(x, 1, 3))
+
 # array
 x = [1, 2, 3, 4, 5]
 @test x == Avro.read(Avro.write(x), typeof(x))
 
+# varints of every encoded length, read back from a buffer long enough for 8-byte loads
+x = [[(-1)^k * 2^k for k = 0:62]; typemin(Int64); typemax(Int64)]
+@test x == Avro.read(Avro.write(x), typeof(x))
+x = Int32[(-1)^k * Int32(2)^k for k = 0:30]
+@test x == Avro.read(Avro.write(x), typeof(x))
+
 # array of strings
 x = ["hey", "there", "stranger"]
 @test x == Avro.read(Avro.write(x), typeof(x))
@@ -97,6 +118,9 @@ r = Avro.read(Avro.write(x), Avro.Record{(:a, :b, :c), Tuple{Int, Float64, Strin
 @test r.b == 3.4
 @test r.c == "hey"
 
+# record schemas derived from julia types are built once and reused
+@test Avro.schematype(typeof(x)) === Avro.schematype(typeof(x))
+
 struct Person
     id::Int
     name::String
@@ -110,6 +134,20 @@ x = Person(10, "Valentin")
 x = [Person(1, "meg"), Person(2, "jo"), Person(3, "beth"), Person(4, "amy")]
 @test x == Avro.read(Avro.write(x), typeof(x))
 
+# parsed schemas have primitive type names resolved up front
+sch = Avro.parseschema("""
+{"type": "record", "name": "Test", "fields": [
+    {"name": "id", "type": "long"},
+    {"name": "name", "type": "string"},
+    {"name": "tags", "type": {"type": "array", "items": ["null", "string"]}}
+]}
+""")
+@test sch.fields[1].type isa Avro.LongType
+@test sch.fields[2].type isa Avro.StringType
+@test sch.fields[3].type.items[2] isa Avro.StringType
+x = (id=42, name="test")
+@test x == Avro.read(Avro.write(x; schema=Avro.parseschema("""{"type": "record", "name": "Test", "fields": [{"name": "id", "type": "long"}, {"name": "name", "type": "string"}]}""")), typeof(x))
+
 # logical
 x = Avro.Decimal{0, 4}(Int128(1))
 @test x == Avro.read(Avro.write(x), typeof(x))
@@ -206,6 +244,32 @@ for comp in (:deflate, :bzip2, :xz, :zstd)
     @test tbl[1].c == nt.c
 end
 
+# debug mode reports per-phase timings while writing/reading
+Avro.withdebug(1) do
+    redirect_stdout(devnull) do
+        tbl = Avro.readtable(Avro.tobuffer(rt; compress=:zstd))
+        @test length(tbl) == 3
+    end
+end
+
+# clock reads for debug timings are skipped unless debug output is on
+@test Avro.debugtime() == 0
+Avro.withdebug(1) do
+    @test Avro.debugtime() > 0
+end
+
+for (comp, level) in ((:deflate, 1), (:deflate, 9), (:bzip2, 1), (:xz, 1), (:zstd, 1), (:zstd, 19))
+    io = Avro.tobuffer(rt; compress=comp, compresslevel=level)
+    tbl = Avro.readtable(io)
+    @test length(tbl) == 3
+    @test tbl[3].c == nt.c
+end
+# the level is actually applied: a higher level compresses this (compressible) table better
+lt = [(a=i % 7, b="value $(i % 13)", c=i) for i = 1:10_000]
+@test length(read(Avro.tobuffer(lt; compress=:deflate, compresslevel=1))) > length(read(Avro.tobuffer(lt; compress=:deflate, compresslevel=9)))
+@test_throws ArgumentError Avro.tobuffer(rt; compresslevel=1)
+@test_throws ArgumentError Avro.tobuffer(rt; compress=:snappy, compresslevel=1)
+
 nt = (a=[1, 2, 3], b=[4.0, 5.0, 6.0], c=["7", "8", "9"])
 io = Avro.tobuffer(nt)
 tbl = Avro.readtable(io)
@@ -230,6 +294,100 @@ io = Avro.tobuffer(dct)
 tbl = Avro.readtable(io)
 @test length(tbl) == 5
 
+# files written with the same schema only parse it once
+n = length(Avro.FILE_SCHEMAS)
+buf1 = read(Avro.tobuffer([(filecache_a=1, filecache_b="x")]))
+buf2 = read(Avro.tobuffer([(filecache_a=2, filecache_b="y")]))
+Avro.readtable(IOBuffer(buf1)); Avro.readtable(IOBuffer(buf2))
+@test length(Avro.FILE_SCHEMAS) == n + 1
+headerschema(buf) = Avro.readvalue(Avro.Binary(), Avro.FileHeaderRecordType, Avro.FileHeader, buf, 1, length(buf), nothing)[1].meta["avro.schema"]
+@test Avro.fileschema(headerschema(buf1)) === Avro.fileschema(headerschema(buf2))
+# once full, the oldest cached schema is evicted first
+jsons = ["{\"type\":\"record\",\"name\":\"evict$i\",\"fields\":[{\"name\":\"a\",\"type\":\"long\"}]}" for i = 1:(Avro.MAX_FILE_SCHEMAS + 1)]
+foreach(Avro.fileschema, jsons)
+@test length(Avro.FILE_SCHEMAS) == Avro.MAX_FILE_SCHEMAS
+@test !haskey(Avro.FILE_SCHEMAS, jsons[1]) && haskey(Avro.FILE_SCHEMAS, jsons[end])
+@test Avro.fileschema(jsons[end]) === Avro.fileschema(jsons[end])
+
+# column-oriented input is encoded from its typed columns
+mt = Tables.table([1 2.5; 3 4.5; 5 6.5])
+tbl = Avro.readtable(Avro.tobuffer(mt))
+@test length(tbl) == 3
+@test tbl.sch == Tables.Schema((:Column1, :Column2), (Float64, Float64))
+@test tbl[2].Column1 == 3.0 && tbl[3].Column2 == 6.5
+
+# with more than one thread, blocks are encoded concurrently; the output must match
+# the serial path byte for byte, apart from the random sync marker
+function stripsync(bytes)
+    sync = bytes[(end - 15):end]
+    out = UInt8[]
+    i = 1
+    while i <= length(bytes)
+        if i + 15 <= length(bytes) && view(bytes, i:(i + 15)) == sync
+            i += 16
+        else
+            push!(out, bytes[i])
+            i += 1
+        end
+    end
+    return out
+end
+
+threadedscript = """
+using Avro, Tables
+@assert Threads.nthreads() == 2
+parts = Tables.partitioner([[(a=i, b="row \$i of partition \$p") for i = 1:100] for p = 1:5])
+for (n, kw) in enumerate((NamedTuple(), (compress=:zstd,), (compress=:deflate, compresslevel=9)))
+    write(joinpath(ARGS[1], "\$n.avro"), read(Avro.tobuffer(parts; kw...)))
+end
+# compressors created for concurrent blocks aren't kept in the shared pool
+@assert length(Avro.COMPRESSORS[:zstd]) == 1
+try
+    Avro.tobuffer(Tables.partitioner([[(a=1,)], [(a=2,)], [(a="x",)]]))
+catch e
+    print(typeof(e))
+end
+"""
+mktempdir() do dir
+    cmd = `$(Base.julia_cmd()) --startup-file=no --project=$(Base.active_project()) -e $threadedscript $dir`
+    threadederr = withenv(() -> read(cmd, String), "JULIA_NUM_THREADS" => "2")
+    parts = Tables.partitioner([[(a=i, b="row $i of partition $p") for i = 1:100] for p = 1:5])
+    for (n, kw) in enumerate((NamedTuple(), (compress=:zstd,), (compress=:deflate, compresslevel=9)))
+        @test stripsync(read(joinpath(dir, "$n.avro"))) == stripsync(read(Avro.tobuffer(parts; kw...)))
+    end
+    # a failing block surfaces the same exception as the serial path, not a TaskFailedException
+    serialerr = try
+        Avro.tobuffer(Tables.partitioner([[(a=1,)], [(a=2,)], [(a="x",)]]))
+        ""
+    catch e
+        string(typeof(e))
+    end
+    @test !isempty(threadederr) && threadederr == serialerr
+end
+
+# schema-less partitions are materialized as columns in the 1st partition's schema order
+parts = Tables.partitioner([[(a=1,), (a=2, b="x")], [(a=3,)], [(b="y", a=4)]])
+io = Avro.tobuffer(parts)
+tbl = Avro.readtable(io)
+@test length(tbl) == 4
+@test tbl.sch == Tables.Schema((:a, :b), (Int, Union{Missing, String}))
+@test tbl[3].a == 3 && tbl[3].b === missing
+@test tbl[4].a == 4 && tbl[4].b == "y"
+# a later partition can't drop a column that doesn't allow missing, or change its type
+@test_throws ArgumentError Avro.tobuffer(Tables.partitioner([[(a=1,), (a=2, b="x")], [(b="y",)]]))
+@test_throws ArgumentError Avro.tobuffer(Tables.partitioner([[(a=1,), (a=2, b="x")], [(a="z", b="y")]]))
+
+# each partition is written as its own block, reusing the block buffer
+parts = Tables.partitioner([[(a=i, b="long string value $i") for i = 1:10], [(a=11, b="x")]])
+for comp in (nothing, :zstd)
+    io = Avro.tobuffer(parts; compress=comp)
+    tbl = Avro.readtable(io)
+    @test length(tbl) == 11
+    @test tbl[10].b == "long string value 10"
+    @test tbl[11].a == 11
+    @test tbl[11].b == "x"
+end
+
 end
 
 @testset "Code generation" begin